@@ -24,6 +24,8 @@ from backend.processors.case_processor import CaseProcessor
 from backend.processors.data_validator import DataValidator
 from backend.generators.narrative_generator import NarrativeGenerator
 from backend.utils.json_utils import save_to_json_file, load_from_json_file
+from backend.utils.json_provider import OrjsonProvider
+from backend.utils.server import run_app
 
 
 # Set up logging
@@ -42,6 +44,7 @@ VALID_SECTION_IDS = [
 
 # Initialize app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)  # Faster JSON responses when orjson is installed
 
 
 
@@ -318,7 +321,8 @@ def regenerate_section(session_id, section_id):
         
         # Regenerate the specified section
         combined_data = data["combined_data"]
-        narrative_generator = NarrativeGenerator(combined_data)
+        # Regenerating must produce fresh text, so LLM calls bypass the response cache
+        narrative_generator = NarrativeGenerator(combined_data, use_cache=False)
         
         # Generate section based on ID
         section_content = ""
@@ -663,4 +667,4 @@ if __name__ == '__main__':
     # Add missing import
     import re
     
-    app.run(debug=debug, host=host, port=port)
\ No newline at end of file
+    run_app(app, host, port, debug=debug, threads=config.API_THREADS)
\ No newline at end of file
@@ -18,13 +18,34 @@ for directory in [TEMPLATE_DIR, UPLOAD_DIR, LOG_DIR]:
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8081"))
 API_DEBUG = os.getenv("API_DEBUG", "False").lower() == "true"
+API_THREADS = int(os.getenv("API_THREADS", "16"))  # Request threads when served by waitress
 
 # LLM settings
 LLM_API_URL = os.getenv("LLM_API_URL", "http://localhost:3000/api/chat")
 LLM_API_KEY = os.getenv("LLM_API_KEY", "")
 LLM_MODEL = os.getenv("LLM_MODEL", "llama3-8b")
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "")  # Request format: "chat" or "completions" (empty detects it from LLM_API_URL)
 LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "4096"))
 LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.2"))  # Low temperature for more predictable outputs
+LLM_POOL_MAXSIZE = int(os.getenv("LLM_POOL_MAXSIZE", "16"))  # Keep-alive connections per LLM host
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))  # Fail fast when the LLM host is unreachable
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))  # Max wait between bytes of an LLM response
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))  # Retries for rate-limited (429) and 502/503/504 responses
+LLM_CONTEXT_WINDOW = int(os.getenv("LLM_CONTEXT_WINDOW", "8192"))  # Model context in tokens; responses are capped to fit (0 disables)
+# Per-section model overrides as "section=model" pairs, e.g. "introduction=llama3-8b,conclusion=llama3-8b";
+# sections not listed use LLM_MODEL
+LLM_SECTION_MODELS = {
+    section.strip(): model.strip()
+    for section, _, model in (item.partition("=") for item in os.getenv("LLM_SECTION_MODELS", "").split(","))
+    if section.strip() and model.strip()
+}
+# Mark the shared system prompt with cache_control for chat gateways that support it (e.g. Anthropic models)
+LLM_PROMPT_CACHE_CONTROL = os.getenv("LLM_PROMPT_CACHE_CONTROL", "False").lower() == "true"
+LLM_WARMUP = os.getenv("LLM_WARMUP", "False").lower() == "true"  # Send a 1-token request when the first client is created
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))  # Max cached LLM responses (0 disables caching)
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.5"))  # Sampled output above this is not reused
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "")  # Shares LLM responses across processes when set (requires diskcache)
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "604800"))  # Seconds before a cached response expires
 
 # SAR Narrative template sections
 TEMPLATES = {
@@ -120,6 +141,23 @@ Closure Summary:
     }
 }
 
+# Keyword score at which activity type detection skips the transaction checks when they cannot
+# change the result (0 disables)
+ACTIVITY_HIGH_CONFIDENCE_THRESHOLD = int(os.getenv("ACTIVITY_HIGH_CONFIDENCE_THRESHOLD", "6"))
+
+# Distinct cases whose activity type classification is kept in memory
+ACTIVITY_CACHE_SIZE = int(os.getenv("ACTIVITY_CACHE_SIZE", "256"))
+
+# Transactions between $8,000 and $10,000 at which a case is classified as structuring outright (0 disables).
+# This skips keyword and breakdown scoring and can change the result (e.g. cash activity with a few
+# near-threshold deposits), so it is off by default. When set, keep it above the 2 that adds to the score.
+STRUCTURING_EARLY_EXIT_COUNT = int(os.getenv("STRUCTURING_EARLY_EXIT_COUNT", "0"))
+
+# Classify a case as money laundering outright when an alert description names it explicitly.
+# This overrides keyword and transaction evidence for another type and can change the result
+# (e.g. structured cash deposits described as money laundering), so it is off by default.
+MONEY_LAUNDERING_EARLY_EXIT = os.getenv("MONEY_LAUNDERING_EARLY_EXIT", "False").lower() == "true"
+
 # Make sure ACTIVITY_TYPES is also defined
 ACTIVITY_TYPES = {
     "STRUCTURING": {
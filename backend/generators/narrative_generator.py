@@ -15,16 +15,18 @@ logger = get_logger(__name__)
 class NarrativeGenerator:
     """Generates SAR narratives based on extracted and validated data"""
     
-    def __init__(self, data: Dict[str, Any], llm_client: Optional[LLMClient] = None):
+    def __init__(self, data: Dict[str, Any], llm_client: Optional[LLMClient] = None, use_cache: bool = True):
         """
         Initialize with validated data
         
         Args:
             data: Validated case and transaction data
             llm_client: Optional LLM client for enhanced generation
+            use_cache: Whether LLM sections may be served from the response cache
         """
         self.data = data
-        self.llm_client = llm_client or LLMClient()
+        self.llm_client = llm_client or LLMClient.get()
+        self.use_cache = use_cache
         self.activity_type = None
     
     def determine_activity_type(self) -> Dict[str, Any]:
@@ -210,7 +212,7 @@ class NarrativeGenerator:
             logger.warning(f"Missing key in introduction template: {e}")
             
             # Fall back to LLM as a second option
-            return self.llm_client.generate_section("introduction", template_vars) or \
+            return self.llm_client.generate_section("introduction", template_vars, use_cache=self.use_cache) or \
                 f"U.S. Bank National Association (USB), is filing this Suspicious Activity Report (SAR) to report {template_vars['activity_type']} totaling {template_vars['total_amount']} {template_vars['derived_from']} by {template_vars['subjects']} in {template_vars['account_type']} account number {template_vars['account_number']}. The suspicious activity was conducted from {template_vars['start_date']} through {template_vars['end_date']}."
     
     def prepare_prior_cases_data(self) -> Dict[str, Any]:
@@ -266,7 +268,7 @@ class NarrativeGenerator:
         # If template formatting failed, try LLM
         if not prior_cases_text:
             data = self.prepare_prior_cases_data()
-            llm_result = self.llm_client.generate_section("prior_cases", data)
+            llm_result = self.llm_client.generate_section("prior_cases", data, use_cache=self.use_cache)
             return llm_result if llm_result else data["prior_cases_text"]
             
         return " ".join(prior_cases_text)
@@ -312,7 +314,7 @@ class NarrativeGenerator:
             logger.warning(f"Missing key in account info template: {e}")
             
             # Fall back to LLM or a simple default
-            return self.llm_client.generate_section("account_info", template_vars) or \
+            return self.llm_client.generate_section("account_info", template_vars, use_cache=self.use_cache) or \
                    f"Personal {template_vars['account_type']} account {template_vars['account_number']} was opened on {template_vars['open_date']} and {template_vars['account_status']}."
     
     def prepare_subject_info_data(self) -> List[Dict[str, Any]]:
@@ -470,7 +472,7 @@ class NarrativeGenerator:
             logger.warning(f"Missing key in activity summary template: {e}")
             
             # Fall back to LLM or a simple default
-            return self.llm_client.generate_section("activity_summary", template_vars) or \
+            return self.llm_client.generate_section("activity_summary", template_vars, use_cache=self.use_cache) or \
                    f"The account activity for {template_vars['account_number']} from {template_vars['start_date']} to {template_vars['end_date']} included total credits of {template_vars['total_credits']} and total debits of {template_vars['total_debits']}."
     
     def generate_transaction_samples(self) -> str:
@@ -487,29 +489,23 @@ class NarrativeGenerator:
         
         # Get up to 5 transactions to showcase
         transactions = unusual_activity.get("transactions", [])
-        sample_count = min(5, len(transactions))
         
         # Format sample list
-        sample_text = "A sample of the suspicious transactions includes:"
-        
-        for i, txn in enumerate(transactions[:sample_count]):
+        samples = []
+        for txn in transactions[:5]:
             date = self.format_date(txn.get("date", ""))
             amount = self.format_currency(txn.get("amount", 0))
             txn_type = txn.get("type", "")
             desc = txn.get("description", "")
             
-            sample_text += f" {date}: {amount}"
+            parts = [f"{date}: {amount}"]
             if txn_type:
-                sample_text += f" ({txn_type})"
+                parts.append(f"({txn_type})")
             if desc:
-                sample_text += f" - {desc}"
-            
-            if i < sample_count - 1:
-                sample_text += ";"
-            else:
-                sample_text += "."
+                parts.append(f"- {desc}")
+            samples.append(" ".join(parts))
         
-        return sample_text
+        return f"A sample of the suspicious transactions includes: {'; '.join(samples)}."
     
     def prepare_conclusion_data(self) -> Dict[str, Any]:
         """
@@ -538,7 +534,7 @@ class NarrativeGenerator:
             "case_number": self.data.get("case_number", ""),
             "activity_type": activity_type.get("name", "suspicious activity"),
             "activity_appearance": activity_type.get("name", "suspicious activity"),
-            "total_amount": activity_summary.get("total_amount", 0),
+            "total_amount": self.format_currency(activity_summary.get("total_amount", 0)),
             "subjects": self.format_subject_list(include_relationship=False),
             "subject_name": self.format_subject_list(include_relationship=False),
             "account_type": account_info.get("account_type", "checking/savings"),
@@ -568,7 +564,7 @@ class NarrativeGenerator:
             logger.warning(f"Missing key in conclusion template: {e}")
             
             # Fall back to LLM or a simple default
-            return self.llm_client.generate_section("conclusion", template_vars) or \
+            return self.llm_client.generate_section("conclusion", template_vars, use_cache=self.use_cache) or \
                    f"In conclusion, USB is reporting ${template_vars['total_amount']} in {template_vars['activity_type']} which gave the appearance of suspicious activity and were conducted by {template_vars['subjects']} in account number {template_vars['account_number']} from {template_vars['start_date']} through {template_vars['end_date']}. USB will conduct a follow-up review to monitor for continuing activity. All requests for supporting documentation can be sent to lawenforcementrequests@usbank.com referencing AML case number {template_vars['case_number']}."
     
     def generate_narrative(self) -> str:
@@ -762,12 +758,28 @@ class NarrativeGenerator:
         activity_data = self.prepare_activity_data()
         conclusion_data = self.prepare_conclusion_data()
         
-        # Generate each section using the LLM
-        intro = self.llm_client.generate_section("introduction", intro_data)
-        prior_cases = self.llm_client.generate_section("prior_cases", prior_cases_data)
-        account_info = self.llm_client.generate_section("account_info", account_info_data)
-        activity_summary = self.llm_client.generate_section("activity_summary", activity_data)
-        conclusion = self.llm_client.generate_section("conclusion", conclusion_data)
+        # Sections whose text is fixed for this case are not sent to the LLM
+        fixed_sections = {}
+        if not self.data.get("prior_cases"):
+            fixed_sections["prior_cases"] = prior_cases_data["prior_cases_text"]
+        
+        # Generate all other sections concurrently using the LLM
+        generated = self.llm_client.generate_sections_batch([
+            (section_type, section_data) for section_type, section_data in [
+                ("introduction", intro_data),
+                ("prior_cases", prior_cases_data),
+                ("account_info", account_info_data),
+                ("activity_summary", activity_data),
+                ("conclusion", conclusion_data)
+            ]
+            if section_type not in fixed_sections
+        ], use_cache=self.use_cache)
+        generated.update(fixed_sections)
+        intro = generated["introduction"]
+        prior_cases = generated["prior_cases"]
+        account_info = generated["account_info"]
+        activity_summary = generated["activity_summary"]
+        conclusion = generated["conclusion"]
         
         # If any section failed, use the template-based approach
         if not intro or not conclusion:
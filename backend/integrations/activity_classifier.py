@@ -0,0 +1,264 @@
+"""
+Rule-based classification of the suspicious activity type in a case
+"""
+import re
+import functools
+import itertools
+from typing import Dict, Any, Optional, List, Tuple, Set, Iterable, Mapping
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+import backend.config as config
+
+# Keywords in alert and activity descriptions that indicate each activity type
+_ACTIVITY_INDICATORS: Dict[str, List[str]] = {
+    "STRUCTURING": ["structure", "ctr", "cash deposit", "multiple deposit", "9000", "below 10000"],
+    "UNUSUAL_ACH": ["ach", "wire", "transfer", "electronic", "payment", "zelle", "venmo"],
+    "UNUSUAL_CASH": ["cash", "atm", "withdraw", "deposit", "currency", "dollar bill"],
+    "MONEY_LAUNDERING": ["launder", "shell", "funnel", "layering", "money laundering", "suspicious"]
+}
+
+# Reverse index from keyword to the activity types it scores
+_KEYWORD_ACTIVITIES: Dict[str, Tuple[str, ...]] = {}
+for _activity, _keywords in _ACTIVITY_INDICATORS.items():
+    for _keyword in _keywords:
+        _KEYWORD_ACTIVITIES[_keyword] = _KEYWORD_ACTIVITIES.get(_keyword, ()) + (_activity,)
+
+# Starting score for each activity type, copied for every classification
+_ZERO_SCORES: Dict[str, int] = dict.fromkeys(_ACTIVITY_INDICATORS, 0)
+
+# Position of each activity type, which decides ties between equal scores
+_ACTIVITY_ORDER: Dict[str, int] = {activity: index for index, activity in enumerate(_ACTIVITY_INDICATORS)}
+
+def _build_keyword_automaton(keywords: Iterable[str]) -> Optional[Any]:
+    """
+    Build an Aho-Corasick automaton over keywords, if pyahocorasick is installed
+    
+    Args:
+        keywords: Keywords to match
+        
+    Returns:
+        ahocorasick.Automaton or None
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton(_KEYWORD_ACTIVITIES)
+
+# Transaction type keywords checked against each credit/debit breakdown entry.
+# Type labels are short, so one compiled alternation per group beats a full keyword scan.
+_CASH_WORDS = frozenset(["cash", "atm", "currency"])
+_ACH_WORDS = frozenset(["ach", "wire", "transfer"])
+_CASH_PATTERN = re.compile("|".join(map(re.escape, sorted(_CASH_WORDS))))
+_ACH_PATTERN = re.compile("|".join(map(re.escape, sorted(_ACH_WORDS))))
+
+def _find_keywords(text: str, automaton: Optional[Any] = _KEYWORD_AUTOMATON,
+                   keywords: Mapping[str, Tuple[str, ...]] = _KEYWORD_ACTIVITIES) -> Set[str]:
+    """
+    Find the distinct keywords contained in text
+    
+    Args:
+        text: Lowercased text to scan
+        automaton: Prebuilt automaton over keywords, or None
+        keywords: Keywords to look for
+        
+    Returns:
+        Set[str]: Keywords found
+    """
+    if not text:
+        return set()
+    if automaton is not None:
+        # Single linear pass over the text regardless of keyword count
+        return {keyword for _, keyword in automaton.iter(text)}
+    return {keyword for keyword in keywords if keyword in text}
+
+def _as_list(value: Any) -> List[Any]:
+    """
+    Normalize a field that holds either one record or a list of records
+    
+    Args:
+        value: A list, a single dict, or anything else
+        
+    Returns:
+        List: The list itself, the dict wrapped in a list, or an empty list
+    """
+    if isinstance(value, list):
+        return value
+    return [value] if isinstance(value, dict) else []
+
+def _best_activity(scores: Dict[str, int]) -> str:
+    """
+    Pick the highest scoring activity type
+    
+    Ties go to the type listed first in _ACTIVITY_INDICATORS; with no positive score
+    the result is UNUSUAL_ACH.
+    
+    Args:
+        scores: Score for each activity type
+        
+    Returns:
+        str: Key of the best matching activity type
+    """
+    best_match: str = "UNUSUAL_ACH"
+    best_score: int = 0
+    for activity in _ACTIVITY_INDICATORS:
+        score = scores[activity]
+        if score > best_score:
+            best_match = activity
+            best_score = score
+    return best_match
+
+def _ranking_settled(scores: Dict[str, int], headroom: int) -> bool:
+    """
+    Check whether the transaction type scores can no longer change the best activity type
+    
+    Breakdown entries only add to UNUSUAL_CASH and UNUSUAL_ACH, each by at most headroom,
+    so the current leader stays ahead if neither could catch up even with every point.
+    
+    Args:
+        scores: Score for each activity type before the transaction type checks
+        headroom: Most points the transaction type checks can add to one activity type
+        
+    Returns:
+        bool: True if _best_activity returns the same type whatever the checks add
+    """
+    leader = _best_activity(scores)
+    for activity in ("UNUSUAL_CASH", "UNUSUAL_ACH"):
+        if activity == leader:
+            continue
+        bound = scores[activity] + headroom
+        if bound > scores[leader] or (bound == scores[leader] and _ACTIVITY_ORDER[activity] < _ACTIVITY_ORDER[leader]):
+            return False
+    return True
+
+# Activity type information returned when the best match has no entry in config
+_DEFAULT_ACTIVITY_TYPE: Dict[str, Any] = config.ACTIVITY_TYPES["UNUSUAL_ACH"]
+
+# Below this many amounts a plain loop is faster than building a NumPy array
+_VECTORIZE_MIN_AMOUNTS = 64
+
+def _count_below_threshold(amounts: Tuple[float, ...]) -> int:
+    """
+    Count amounts strictly between $8,000 and the $10,000 CTR threshold
+    
+    Args:
+        amounts: Transaction amounts
+        
+    Returns:
+        int: Number of amounts in range
+    """
+    if len(amounts) < _VECTORIZE_MIN_AMOUNTS:
+        return sum(1 for amount in amounts if 8000 < amount < 10000)
+    
+    import numpy as np  # Deferred so importing the client does not load NumPy
+    
+    amounts_array = np.fromiter(amounts, dtype=np.float64, count=len(amounts))
+    return int(np.count_nonzero((amounts_array > 8000) & (amounts_array < 10000)))
+
+@functools.lru_cache(maxsize=config.ACTIVITY_CACHE_SIZE)
+def _classify_activity(alert_desc: str, activity_desc: str, txn_types: Tuple[str, ...],
+                       amounts: Tuple[float, ...]) -> str:
+    """
+    Score the activity types against the fields of a case that indicate them
+    
+    Args:
+        alert_desc: Lowercased alert descriptions
+        activity_desc: Lowercased activity summary description
+        txn_types: Lowercased credit and debit breakdown transaction types
+        amounts: Numeric unusual activity transaction amounts
+        
+    Returns:
+        str: Key of the best matching activity type
+    """
+    # Look for multiple transactions below CTR threshold ($10,000)
+    below_threshold_count: int = _count_below_threshold(amounts)
+    
+    # Enough near-threshold transactions decide the type before any text is scanned
+    early_exit_count: int = config.STRUCTURING_EARLY_EXIT_COUNT
+    if early_exit_count > 0 and below_threshold_count >= early_exit_count:
+        return "STRUCTURING"
+    
+    # An alert that names money laundering outright needs no keyword scoring
+    if config.MONEY_LAUNDERING_EARLY_EXIT and "money laundering" in alert_desc:
+        return "MONEY_LAUNDERING"
+    
+    # Count keyword matches for each activity type, weighting alert text higher
+    scores: Dict[str, int] = _ZERO_SCORES.copy()
+    
+    for keyword in _find_keywords(alert_desc):
+        for activity in _KEYWORD_ACTIVITIES[keyword]:
+            scores[activity] += 2
+    
+    for keyword in _find_keywords(activity_desc):
+        for activity in _KEYWORD_ACTIVITIES[keyword]:
+            scores[activity] += 1
+    
+    # Multiple transactions just below the CTR threshold point to structuring
+    if below_threshold_count >= 2:
+        scores["STRUCTURING"] += 3
+    
+    # A strong keyword signal decides the type without scanning transactions,
+    # but only when no breakdown entry could still change the winner
+    threshold: int = config.ACTIVITY_HIGH_CONFIDENCE_THRESHOLD
+    if threshold > 0 and max(scores.values()) >= threshold and _ranking_settled(scores, 2 * len(txn_types)):
+        return _best_activity(scores)
+    
+    for txn_type in txn_types:
+        # Check for cash-related keywords
+        if _CASH_PATTERN.search(txn_type):
+            scores["UNUSUAL_CASH"] += 2
+        
+        # Check for ACH/wire-related keywords
+        if _ACH_PATTERN.search(txn_type):
+            scores["UNUSUAL_ACH"] += 2
+    
+    # Get activity type with highest score, default to UNUSUAL_ACH
+    return _best_activity(scores)
+
+def classify_activity(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Determine type of suspicious activity from data
+    
+    Args:
+        data: Case and transaction data
+        
+    Returns:
+        Dict: Activity type information
+    """
+    # Extract relevant information for detection
+    # Alert info may be a single alert or a list of them; lowercase the joined text once
+    alert_desc = " ".join(
+        alert.get("description", "") for alert in _as_list(data.get("alert_info")) if isinstance(alert, dict)
+    ).lower()
+    
+    activity_desc = data.get("activity_summary", {}).get("description", "").lower()
+    
+    # Look for transaction patterns
+    transaction_summary = data.get("transaction_summary", {})
+    txn_types = tuple(
+        breakdown.get("type", "").lower()
+        for breakdown in itertools.chain(
+            transaction_summary.get("credit_breakdown", []),
+            transaction_summary.get("debit_breakdown", [])
+        )
+    )
+    
+    # Only numeric amounts take part in the structuring check
+    transactions = data.get("unusual_activity", {}).get("transactions", [])
+    amounts = tuple(
+        float(amount) for txn in transactions if isinstance(amount := txn.get("amount"), (int, float))
+    )
+    
+    # Classification only depends on these fields, so repeated cases are served from the cache
+    best_match = _classify_activity(alert_desc, activity_desc, txn_types, amounts)
+    
+    # Return the activity type information from config
+    return config.ACTIVITY_TYPES.get(best_match, _DEFAULT_ACTIVITY_TYPE)
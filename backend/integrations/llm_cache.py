@@ -0,0 +1,210 @@
+"""
+Tiered cache for LLM responses
+"""
+import hashlib
+import logging
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+class CacheBackend(Protocol):
+    """Shared cache tier, such as diskcache.Cache, reachable from several processes"""
+
+    def get(self, key: bytes) -> Optional[str]:
+        ...
+
+    def set(self, key: bytes, value: str, expire: Optional[int] = None) -> Any:
+        ...
+
+class ResponseCache:
+    """Thread-safe bounded LRU cache for LLM responses keyed on the exact request"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of cached responses (0 disables caching)
+            ttl: Seconds before a response expires (None keeps responses until evicted)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(api_url: str, provider: str, model: str, prompt: str, max_tokens: int, temperature: float) -> bytes:
+        """
+        Build a compact cache key for a request
+
+        Args:
+            api_url: Endpoint the request is sent to
+            provider: API flavour (chat or completions), which shapes the response
+            model: Model identifier
+            prompt: Prompt text
+            max_tokens: Maximum tokens in the response
+            temperature: Temperature setting
+
+        Returns:
+            bytes: Cache key
+        """
+        return (
+            hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+            + struct.pack("<If", max_tokens, temperature)
+            + b"\0".join(part.encode("utf-8") for part in (api_url, provider, model))
+        )
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Return the cached response for key, or None on a miss or if it has expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: bytes, value: str) -> None:
+        """Store a response, evicting the least recently used entry when full"""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self._lock:
+            self._entries.clear()
+
+def open_disk_cache(directory: str) -> Optional[CacheBackend]:
+    """
+    Open an on-disk response cache shared across worker processes
+
+    Args:
+        directory: Cache directory (empty disables the disk tier)
+
+    Returns:
+        diskcache.Cache or None if disabled or diskcache is not installed
+    """
+    if not directory:
+        return None
+    try:
+        import diskcache
+    except ImportError:
+        logger.warning("LLM_CACHE_DIR is set but diskcache is not installed; responses will only be cached in memory")
+        return None
+    return diskcache.Cache(directory, size_limit=1 << 30)
+
+class LLMCache:
+    """
+    Response cache checked in order: in-process LRU, then a shared backend
+
+    Hits in the shared backend are copied into the in-process LRU. Requests sampled above
+    max_temperature bypass every tier so varied output is never replayed.
+    """
+
+    def __init__(self, maxsize: int = 1024, max_temperature: float = 0.5,
+                 backend: Optional[CacheBackend] = None, ttl: Optional[int] = None):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of responses held in memory (0 disables the memory tier)
+            max_temperature: Highest temperature whose responses are cached
+            backend: Optional shared cache tier
+            ttl: Seconds before a cached response expires
+        """
+        self.max_temperature = max_temperature
+        self.memory = ResponseCache(maxsize, ttl)
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def cacheable(self, temperature: float) -> bool:
+        """Return whether responses at this temperature are served from and stored in the cache"""
+        return temperature <= self.max_temperature
+
+    def get(self, api_url: str, provider: str, model: str, prompt: str, max_tokens: int,
+            temperature: float) -> Optional[str]:
+        """
+        Look up the response for a request
+
+        Args:
+            api_url: Endpoint the request is sent to
+            provider: API flavour (chat or completions)
+            model: Model identifier
+            prompt: Prompt text
+            max_tokens: Maximum tokens in the response
+            temperature: Temperature setting
+
+        Returns:
+            str: Cached response, or None on a miss
+        """
+        if not self.cacheable(temperature):
+            return None
+
+        key = ResponseCache.make_key(api_url, provider, model, prompt, max_tokens, temperature)
+        value = self.memory.get(key)
+        if value is None and self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, api_url: str, provider: str, model: str, prompt: str, max_tokens: int, temperature: float,
+            response: str) -> None:
+        """
+        Store the response for a request in every tier
+
+        Args:
+            api_url: Endpoint the request is sent to
+            provider: API flavour (chat or completions)
+            model: Model identifier
+            prompt: Prompt text
+            max_tokens: Maximum tokens in the response
+            temperature: Temperature setting
+            response: Generated response
+        """
+        if not response or not self.cacheable(temperature):
+            return
+
+        key = ResponseCache.make_key(api_url, provider, model, prompt, max_tokens, temperature)
+        self.memory.set(key, response)
+        if self.backend is not None:
+            self.backend.set(key, response, expire=self.ttl)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get hit and miss counts since the cache was created or cleared
+
+        Returns:
+            Dict[str, int]: Hits and misses
+        """
+        with self._stats_lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        """Remove all in-process entries and reset the counters; the shared tier is left intact"""
+        self.memory.clear()
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
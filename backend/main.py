@@ -15,13 +15,16 @@ if current_dir not in sys.path:
 # Now use imports relative to the backend directory
 from api.routes import api_bp
 import config  # import directly since we're in the same directory
+from utils.json_provider import OrjsonProvider
 from utils.logger import get_logger
+from utils.server import run_app
 
 logger = get_logger(__name__)
 
 def create_app():
     """Create and configure Flask application"""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     
     # Register blueprints
     app.register_blueprint(api_bp, url_prefix='/api')
@@ -58,7 +61,7 @@ def main():
     
     app = create_app()
     logger.info(f"Starting SAR Narrative Generator API on {args.host}:{args.port}, debug={args.debug}")
-    app.run(host=args.host, port=args.port, debug=args.debug)
+    run_app(app, args.host, args.port, debug=args.debug, threads=config.API_THREADS)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -370,7 +370,7 @@ def main():
     llm_client = None
     if args.use_llm:
         print("Initializing LLM client for enhanced generation...")
-        llm_client = LLMClient()
+        llm_client = LLMClient.get()
     
     # Generate narrative
     print("Generating SAR narrative...")
@@ -0,0 +1,51 @@
+"""
+Flask JSON provider backed by orjson
+"""
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Options Flask passes for compact responses, which orjson output already satisfies
+_COMPACT_OPTIONS = {"separators": (",", ":")}
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Serialize API responses with orjson when it is installed
+
+    Keys are sorted when sort_keys is set, and datetimes, dataclasses and other extra types go
+    through Flask's default handler. Output differs from the standard provider in a few ways:
+    non-ASCII text is written as UTF-8 rather than escaped (ensure_ascii is off, also for the
+    fallback), NaN and infinite floats become null, and floats use the shortest form
+    (1e16 and 1e-7 instead of 1e+16 and 1e-07). Calls with formatting options (e.g. indented
+    debug output) and values orjson rejects, such as non-string keys, use the standard encoder.
+    """
+
+    ensure_ascii = False
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize data as JSON to a string
+
+        Args:
+            obj: The data to serialize
+            **kwargs: Options for json.dumps; anything but compact separators uses the standard encoder
+
+        Returns:
+            str: JSON text
+        """
+        if orjson is None or (kwargs and kwargs != _COMPACT_OPTIONS):
+            return super().dumps(obj, **kwargs)
+
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+        except TypeError:
+            return super().dumps(obj, **kwargs)
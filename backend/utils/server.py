@@ -0,0 +1,34 @@
+"""
+Serve the Flask application
+"""
+import logging
+from typing import Any
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
+logger = logging.getLogger(__name__)
+
+def run_app(app: Any, host: str, port: int, debug: bool = False, threads: int = 16) -> None:
+    """
+    Serve the application with waitress, or the Flask development server in debug mode
+
+    Requests spend most of their time waiting on the LLM, so the number of worker
+    threads bounds how many narratives are generated at once.
+
+    Args:
+        app: Flask application
+        host: Host to listen on
+        port: Port to listen on
+        debug: Use the Flask development server with the debugger and reloader
+        threads: Worker threads handling requests
+    """
+    if debug or serve is None:
+        if not debug:
+            logger.warning("waitress is not installed; serving with the Flask development server")
+        app.run(host=host, port=port, debug=debug, threaded=True)
+        return
+
+    serve(app, host=host, port=port, threads=threads)
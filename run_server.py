@@ -16,6 +16,7 @@ sys.path.insert(0, BACKEND_DIR)
 
 # Import app directly - simplest solution
 from app import app, config
+from utils.server import run_app
 
 if __name__ == '__main__':
     # Parse command line arguments
@@ -30,4 +31,4 @@ if __name__ == '__main__':
     args = parser.parse_args()
     
     print(f"Starting SAR Narrative Generator API on {args.host}:{args.port}, debug={args.debug}")
-    app.run(host=args.host, port=args.port, debug=args.debug)
+    run_app(app, args.host, args.port, debug=args.debug, threads=config.API_THREADS)